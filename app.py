@@ -1,62 +1,165 @@
 
-import json
+import gzip
+import hashlib
 import time
 import threading
-from collections import deque
-from flask import Flask, jsonify, render_template
+import zlib
+from datetime import datetime
+import numpy as np
+import orjson
+from flask import Flask, render_template, request
 from apscheduler.schedulers.background import BackgroundScheduler
 
-from signal_engine import run_full_analysis
+from signal_engine import configure_logging, fetch_inputs, analyze_inputs
 
 app = Flask(__name__)
 
 # --- In-memory cache ---
+# Published as an immutable snapshot: refresh_data builds a new dict and rebinds
+# _cache (atomic under the GIL), so readers never need a lock.
 _cache = {
     'dashboard_data': None,
     'last_updated': 0,
+    'etag': None,
+    # Pre-serialized JSON bodies, rebuilt once per refresh
+    'dashboard_bytes': None,
+    'signal_bytes': None,
+    'news_bytes': None,
+    'derivatives_bytes': None,
+    'polymarket_bytes': None,
+    'bet_suggestion_bytes': None,
+    # ...and their gzip encodings (the dashboard as a resumable stream, see _gzip_stream)
+    'dashboard_gzip': None,
+    'signal_gzip': None,
+    'news_gzip': None,
+    'derivatives_gzip': None,
+    'polymarket_gzip': None,
+    'bet_suggestion_gzip': None,
 }
-_cache_lock = threading.Lock()
 
 # --- Signal history (last 50 signals) ---
+# Kept in a preallocated ring buffer: one structured row per refresh, written
+# in place instead of allocating a dict per entry.
 MAX_SIGNAL_HISTORY = 50
-_signal_history = deque(maxlen=MAX_SIGNAL_HISTORY)
-_history_lock = threading.Lock()
+HISTORY_SIGNALS = ('funding', 'liquidations', 'order_book', 'long_short_ratio', 'news')
+_HISTORY_DTYPE = np.dtype(
+    [
+        ('timestamp', 'i8'),
+        ('btc_price', 'f8'),
+        ('direction', 'U4'),
+        ('confidence', 'f8'),
+        ('weighted_score', 'f8'),
+    ]
+    + [(name, 'U7') for name in HISTORY_SIGNALS]
+)
+_signal_history = np.zeros(MAX_SIGNAL_HISTORY, dtype=_HISTORY_DTYPE)
+_history_next = 0    # slot the next entry is written to
+_history_count = 0
+_history_lock = threading.Lock()    # serializes writers only
+# Immutable copy republished after every write; readers load it without locking
+_signal_history_snapshot = ()
 
 REFRESH_INTERVAL_SECONDS = 45
 
+# Digest of the inputs behind the cached dashboard; identical inputs skip re-analysis
+_last_input_hash = None
+GZIP_LEVEL = 6
+# NumPy scalars/arrays from the collectors serialize natively, no .tolist()/float() round trip
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+
+def ojsonify(obj, status=200):
+    """Like flask.jsonify, but serializes with orjson straight to bytes."""
+    return app.response_class(orjson.dumps(obj, option=ORJSON_OPTIONS), status=status, mimetype='application/json')
+
 
 def refresh_data():
     """Background job: fetch all data and update cache."""
+    global _cache, _last_input_hash
     try:
         print(f"[{time.strftime('%H:%M:%S')}] Refreshing dashboard data...")
-        analysis = run_full_analysis()
+        inputs = fetch_inputs()
+        input_hash = hashlib.blake2b(
+            orjson.dumps(inputs, option=ORJSON_OPTIONS), digest_size=16).digest()
+
+        if input_hash == _last_input_hash and _cache['dashboard_data'] is not None:
+            # Nothing upstream changed: keep the analysis, views and ETag, just mark them fresh
+            dashboard = _cache['dashboard_data']
+            _cache = {**_cache, 'last_updated': time.time()}
+            record_signal_history({**dashboard, 'timestamp': int(time.time())})
+            print(f"[{time.strftime('%H:%M:%S')}] Inputs unchanged, dashboard data kept.")
+            return
+
+        analysis = analyze_inputs(inputs)
 
         # Make the analysis JSON-serializable
         dashboard = serialize_analysis(analysis)
+        last_updated = time.time()
+        _cache = {
+            'dashboard_data': dashboard,
+            'last_updated': last_updated,
+            'etag': str(int(last_updated)),
+            **serialize_views(dashboard),
+        }
+        _last_input_hash = input_hash
 
-        with _cache_lock:
-            _cache['dashboard_data'] = dashboard
-            _cache['last_updated'] = time.time()
-
-        # Record signal history
-        with _history_lock:
-            _signal_history.append({
-                'timestamp': dashboard['timestamp'],
-                'btc_price': dashboard.get('btc_price'),
-                'direction': dashboard.get('final_signal', {}).get('direction'),
-                'confidence': dashboard.get('final_signal', {}).get('confidence'),
-                'weighted_score': dashboard.get('final_signal', {}).get('weighted_score'),
-                'signals': {
-                    k: v['signal']
-                    for k, v in dashboard.get('signals', {}).items()
-                },
-            })
+        record_signal_history(dashboard)
 
         print(f"[{time.strftime('%H:%M:%S')}] Dashboard data refreshed.")
     except Exception as e:
         print(f"[{time.strftime('%H:%M:%S')}] Error refreshing data: {e}")
 
 
+def record_signal_history(dashboard):
+    """Write the dashboard's signal into the next ring buffer slot and republish the snapshot."""
+    global _history_next, _history_count, _signal_history_snapshot
+    final = dashboard.get('final_signal') or {}
+    signals = dashboard.get('signals', {})
+    row = (
+        dashboard['timestamp'],
+        _or_nan(dashboard.get('btc_price')),
+        final.get('direction') or '',
+        _or_nan(final.get('confidence')),
+        _or_nan(final.get('weighted_score')),
+        *(signals[name].signal if name in signals else '' for name in HISTORY_SIGNALS),
+    )
+    with _history_lock:
+        _signal_history[_history_next] = row
+        _history_next = (_history_next + 1) % MAX_SIGNAL_HISTORY
+        _history_count = min(_history_count + 1, MAX_SIGNAL_HISTORY)
+        _signal_history_snapshot = tuple(_history_rows())
+
+
+def _history_rows():
+    """Yields recorded signals, oldest first, as JSON-friendly dicts. Caller holds _history_lock."""
+    if _history_count < MAX_SIGNAL_HISTORY:
+        rows = _signal_history[:_history_count].tolist()
+    else:
+        rows = np.roll(_signal_history, -_history_next).tolist()
+
+    n_fixed = len(_HISTORY_DTYPE) - len(HISTORY_SIGNALS)
+    return (
+        {
+            'timestamp': row[0],
+            'btc_price': row[1],    # NaN (missing) serializes as null
+            'direction': row[2] or None,
+            'confidence': row[3],
+            'weighted_score': row[4],
+            'signals': {
+                name: value
+                for name, value in zip(HISTORY_SIGNALS, row[n_fixed:])
+                if value
+            },
+        }
+        for row in rows
+    )
+
+
+def _or_nan(value):
+    """Store missing numbers as NaN in the float history columns."""
+    return float('nan') if value is None else value
+
+
 def serialize_analysis(analysis):
     """Convert analysis result to a JSON-friendly dict."""
     data = {
@@ -98,11 +201,11 @@ def serialize_analysis(analysis):
             'neutral_count': news['neutral_count'],
             'headlines': [
                 {
-                    'title': h['title'],
-                    'source': h['source'],
-                    'published_at': h['published_at'],
-                    'url': h['url'],
-                    'sentiment': h['sentiment'],
+                    'title': h.title,
+                    'source': h.source,
+                    'published_at': h.published_at,
+                    'url': h.url,
+                    'sentiment': h.sentiment,
                 }
                 for h in news.get('headlines', [])[:10]
             ],
@@ -111,6 +214,68 @@ def serialize_analysis(analysis):
     return data
 
 
+def serialize_views(dashboard):
+    """
+    Serialize every API view of the dashboard to JSON bytes, plain and gzipped.
+    The dashboard only changes once per refresh, so the handlers just serve these.
+    """
+    views = {
+        'dashboard': orjson.dumps(dashboard, option=ORJSON_OPTIONS),
+        'signal': orjson.dumps({
+            'btc_price': dashboard.get('btc_price'),
+            'final_signal': dashboard.get('final_signal'),
+            'odds_value': dashboard.get('odds_value'),
+            'signals': dashboard.get('signals'),
+        }, option=ORJSON_OPTIONS),
+        'news': orjson.dumps(dashboard.get('news', {}), option=ORJSON_OPTIONS),
+        'derivatives': orjson.dumps(dashboard.get('derivatives', {}), option=ORJSON_OPTIONS),
+        'polymarket': orjson.dumps(dashboard.get('polymarket', {}), option=ORJSON_OPTIONS),
+        'bet_suggestion': orjson.dumps(_bet_suggestion(dashboard), option=ORJSON_OPTIONS),
+    }
+    serialized = {}
+    for name, body in views.items():
+        serialized[f'{name}_bytes'] = body
+        if name == 'dashboard':
+            # The dashboard envelope ends in a per-request cache age, so keep its stream open
+            serialized['dashboard_gzip'] = _gzip_stream(_DASHBOARD_PREFIX + body + _DASHBOARD_SUFFIX)
+        else:
+            serialized[f'{name}_gzip'] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return serialized
+
+
+def _gzip_stream(head):
+    """
+    Starts a gzip stream over `head` and returns (compressed_so_far, compressor).
+    Each request appends its own tail to a copy of the compressor, so the
+    bulk of the body is only ever compressed once.
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)    # wbits=31: gzip container
+    return compressor.compress(head), compressor
+
+
+def _bet_suggestion(data):
+    """
+    Build the bet suggestion view,
+    including up/down attribute counts and current Polymarket line.
+    """
+    up_attributes = 0
+    down_attributes = 0
+    signals = data.get('signals', {})
+    for signal_name, signal_data in signals.items():
+        if signal_data.signal == 'UP':
+            up_attributes += 1
+        elif signal_data.signal == 'DOWN':
+            down_attributes += 1
+
+    return {
+        'final_signal': data.get('final_signal'),
+        'up_attributes_count': up_attributes,
+        'down_attributes_count': down_attributes,
+        'polymarket_line': data.get('polymarket'),
+        'timestamp': data.get('timestamp')
+    }
+
+
 def _serialize_liquidations(liqs):
     """Trim liquidation events for API response."""
     if not liqs:
@@ -127,81 +292,112 @@ def _serialize_liquidations(liqs):
 
 # --- API Routes ---
 
+# /api/dashboard-data wraps the cached dashboard as {"data": ..., "cache_age_seconds": N}
+_DASHBOARD_PREFIX = b'{"data":'
+_DASHBOARD_SUFFIX = b',"cache_age_seconds":'
+
+
+def _accepts_gzip():
+    """Whether the client negotiated gzip via Accept-Encoding."""
+    return request.accept_encodings['gzip'] > 0
+
+
+def _etag(cache, gzipped):
+    """Each encoding is a distinct representation, so it gets its own ETag."""
+    return cache['etag'] + '-gzip' if gzipped else cache['etag']
+
+
+def _with_cache_headers(response, cache, gzipped, weak=False):
+    """
+    Tag a response with the refresh's ETag, cacheable until the next refresh is due.
+    weak=True for bodies whose bytes vary per request within one refresh.
+    """
+    age = time.time() - cache['last_updated']
+    response.set_etag(_etag(cache, gzipped), weak=weak)
+    response.cache_control.max_age = max(0, int(REFRESH_INTERVAL_SECONDS - age))
+    response.vary.add('Accept-Encoding')
+    if gzipped and response.status_code == 200:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def _not_modified(cache, gzipped, weak=False):
+    """Returns a 304 if the client already has this refresh's data, else None."""
+    # If-None-Match uses weak comparison, so W/"..." tags match too
+    if request.if_none_match.contains_weak(_etag(cache, gzipped)):
+        return _with_cache_headers(app.response_class(status=304), cache, gzipped, weak)
+    return None
+
+
+def _cached_json(view, not_ready='Data not yet available.'):
+    """Serve a pre-serialized view from the cache, or 503 before the first refresh."""
+    cache = _cache
+    if cache[f'{view}_bytes'] is None:
+        return ojsonify({'error': not_ready}, status=503)
+
+    gzipped = _accepts_gzip()
+    body = cache[f'{view}_gzip'] if gzipped else cache[f'{view}_bytes']
+    return _not_modified(cache, gzipped) or _with_cache_headers(
+        app.response_class(body, mimetype='application/json'), cache, gzipped)
+
+
 @app.route('/api/dashboard-data')
 def api_dashboard_data():
     """Returns the full dashboard state including all signals and data."""
-    with _cache_lock:
-        data = _cache['dashboard_data']
-        last_updated = _cache['last_updated']
-
-    if data is None:
-        return jsonify({'error': 'Data not yet available. Please wait for first refresh.'}), 503
-
-    return jsonify({
-        'data': data,
-        'cache_age_seconds': round(time.time() - last_updated, 1),
-    })
+    cache = _cache
+    body = cache['dashboard_bytes']
+    last_updated = cache['last_updated']
+
+    if body is None:
+        return ojsonify({'error': 'Data not yet available. Please wait for first refresh.'}, status=503)
+
+    gzipped = _accepts_gzip()
+    # cache_age_seconds makes the bytes differ per request, so the tag is weak
+    not_modified = _not_modified(cache, gzipped, weak=True)
+    if not_modified:
+        return not_modified
+
+    # Only the cache age changes between refreshes; splice it onto the cached body
+    tail = orjson.dumps(round(time.time() - last_updated, 1)) + b'}'
+    if gzipped:
+        head, compressor = cache['dashboard_gzip']
+        compressor = compressor.copy()
+        payload = head + compressor.compress(tail) + compressor.flush()
+    else:
+        payload = _DASHBOARD_PREFIX + body + _DASHBOARD_SUFFIX + tail
+    return _with_cache_headers(
+        app.response_class(payload, mimetype='application/json'), cache, gzipped, weak=True)
 
 
 @app.route('/api/signal')
 def api_signal():
     """Returns just the current signal recommendation."""
-    with _cache_lock:
-        data = _cache['dashboard_data']
-
-    if data is None:
-        return jsonify({'error': 'Data not yet available.'}), 503
-
-    return jsonify({
-        'btc_price': data.get('btc_price'),
-        'final_signal': data.get('final_signal'),
-        'odds_value': data.get('odds_value'),
-        'signals': data.get('signals'),
-    })
+    return _cached_json('signal')
 
 
 @app.route('/api/news')
 def api_news():
     """Returns the latest news headlines and sentiment."""
-    with _cache_lock:
-        data = _cache['dashboard_data']
-
-    if data is None:
-        return jsonify({'error': 'Data not yet available.'}), 503
-
-    return jsonify(data.get('news', {}))
+    return _cached_json('news')
 
 
 @app.route('/api/derivatives')
 def api_derivatives():
     """Returns derivatives data (funding, OI, L/S ratio, liquidations)."""
-    with _cache_lock:
-        data = _cache['dashboard_data']
-
-    if data is None:
-        return jsonify({'error': 'Data not yet available.'}), 503
-
-    return jsonify(data.get('derivatives', {}))
+    return _cached_json('derivatives')
 
 
 @app.route('/api/polymarket')
 def api_polymarket():
     """Returns current Polymarket market context."""
-    with _cache_lock:
-        data = _cache['dashboard_data']
-
-    if data is None:
-        return jsonify({'error': 'Data not yet available.'}), 503
-
-    return jsonify(data.get('polymarket', {}))
+    return _cached_json('polymarket')
 
 
 @app.route('/api/signal-history')
 def api_signal_history():
     """Returns the history of recent signals."""
-    with _history_lock:
-        history = list(_signal_history)
-    return jsonify({'history': history, 'count': len(history)})
+    history = _signal_history_snapshot
+    return ojsonify({'history': history, 'count': len(history)})
 
 
 @app.route('/api/bet-suggestion')
@@ -210,28 +406,7 @@ def api_bet_suggestion():
     Returns the final output for a bet suggestion,
     including up/down attribute counts and current Polymarket line.
     """
-    with _cache_lock:
-        data = _cache['dashboard_data']
-
-    if data is None:
-        return jsonify({'error': 'Data not yet available. Please wait for first refresh.'}), 503
-
-    up_attributes = 0
-    down_attributes = 0
-    signals = data.get('signals', {})
-    for signal_name, signal_data in signals.items():
-        if signal_data.get('signal') == 'UP':
-            up_attributes += 1
-        elif signal_data.get('signal') == 'DOWN':
-            down_attributes += 1
-
-    return jsonify({
-        'final_signal': data.get('final_signal'),
-        'up_attributes_count': up_attributes,
-        'down_attributes_count': down_attributes,
-        'polymarket_line': data.get('polymarket'),
-        'timestamp': data.get('timestamp')
-    })
+    return _cached_json('bet_suggestion', 'Data not yet available. Please wait for first refresh.')
 
 
 @app.route('/')
@@ -243,9 +418,8 @@ def index():
 @app.route('/api/health')
 def health():
     """Health check endpoint."""
-    with _cache_lock:
-        last = _cache['last_updated']
-    return jsonify({
+    last = _cache['last_updated']
+    return ojsonify({
         'status': 'ok',
         'last_updated': last,
         'cache_age_seconds': round(time.time() - last, 1) if last > 0 else None,
@@ -263,12 +437,13 @@ def start_scheduler():
         seconds=REFRESH_INTERVAL_SECONDS,
         id='refresh_dashboard',
         max_instances=1,
+        # Do an immediate first refresh without blocking server startup
+        next_run_time=datetime.now(),
     )
     scheduler.start()
-    # Do an immediate first refresh
-    refresh_data()
 
 
 if __name__ == '__main__':
+    configure_logging()
     start_scheduler()
     app.run(debug=False, host='0.0.0.0', port=5124)
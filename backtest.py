@@ -0,0 +1,152 @@
+
+import numba
+import numpy as np
+
+from data_collectors.news_data import SENTIMENT_THRESHOLD
+from signal_engine import (
+    FUNDING_HIGH_THRESHOLD, FUNDING_LOW_THRESHOLD, LIQ_DOMINANCE_RATIO,
+    WALL_BID_STRONG, WALL_ASK_STRONG, LS_RATIO_HIGH, LS_RATIO_LOW,
+    MIN_ALIGNED_SIGNALS, SIGNAL_WEIGHTS,
+)
+
+# Numeric core of the signal engine for backtest sweeps. Mirrors the analyze_*
+# functions and generate_signal in signal_engine.py without the detail strings;
+# the live path keeps using those. Thresholds and weights are shared with the
+# analyzers; numba freezes them at compile time, so the kernels are deliberately
+# not cached to disk (the cache would not notice a retuned threshold).
+
+# Direction codes
+DIR_DOWN = -1
+DIR_SKIP = 0
+DIR_UP = 1
+
+# Column order of the (T, 5) arrays taken by generate_signals_batch
+SIGNAL_KEYS = tuple(key for key, _ in SIGNAL_WEIGHTS)
+_W = dict(SIGNAL_WEIGHTS)
+_WEIGHTS = np.array([_W[key] for key in SIGNAL_KEYS])
+
+# Per-signal weights for the kernel, looked up by key so reordering the table can't swap them
+_W_FUNDING = _W['funding']
+_W_LIQ = _W['liquidations']
+_W_OB = _W['order_book']
+_W_LS = _W['long_short_ratio']
+_W_NEWS = _W['news']
+
+
+@numba.njit
+def _score_window(rate, long_usd, short_usd, wall_ratio, ls_ratio, news_score,
+                  have_funding, have_liq, have_ob, have_ls, have_news):
+    """
+    Scores one window. Missing inputs (have_* False) count as neutral.
+    Returns (dir_code, confidence, total_score, bull_cnt, bear_cnt).
+    """
+    bull = 0
+    bear = 0
+    total = 0.0
+
+    # Funding: crowded longs → bearish, crowded shorts → bullish
+    if have_funding:
+        if rate >= FUNDING_HIGH_THRESHOLD:
+            total -= min(1.0, rate / (FUNDING_HIGH_THRESHOLD * 3)) * _W_FUNDING
+            bear += 1
+        elif rate <= FUNDING_LOW_THRESHOLD:
+            total += min(1.0, abs(rate) / (abs(FUNDING_LOW_THRESHOLD) * 3)) * _W_FUNDING
+            bull += 1
+
+    # Liquidations: flushed side's selling/buying is exhausted
+    if have_liq and long_usd + short_usd != 0:
+        if short_usd > 0 and long_usd / short_usd >= LIQ_DOMINANCE_RATIO:
+            total += min(1.0, (long_usd / short_usd - 1) / 3) * _W_LIQ
+            bull += 1
+        elif long_usd > 0 and short_usd / long_usd >= LIQ_DOMINANCE_RATIO:
+            total -= min(1.0, (short_usd / long_usd - 1) / 3) * _W_LIQ
+            bear += 1
+
+    # Order book walls
+    if have_ob:
+        if wall_ratio >= WALL_BID_STRONG:
+            total += min(1.0, (wall_ratio - 1) / 2) * _W_OB
+            bull += 1
+        elif wall_ratio <= WALL_ASK_STRONG:
+            total -= min(1.0, (1 - wall_ratio) / 0.5) * _W_OB
+            bear += 1
+
+    # Long/short ratio (analyzer score already halved): contrarian
+    if have_ls:
+        if ls_ratio >= LS_RATIO_HIGH:
+            total -= min(1.0, (ls_ratio - 2.0) / 2.0) * 0.5 * _W_LS
+            bear += 1
+        elif ls_ratio <= LS_RATIO_LOW:
+            total += min(1.0, (1.0 - ls_ratio) / 0.5) * 0.5 * _W_LS
+            bull += 1
+
+    # News: same cutoff as get_news_summary's overall sentiment
+    if have_news:
+        if news_score > SENTIMENT_THRESHOLD:
+            total += news_score * _W_NEWS
+            bull += 1
+        elif news_score < -SENTIMENT_THRESHOLD:
+            total += news_score * _W_NEWS
+            bear += 1
+
+    if bull >= MIN_ALIGNED_SIGNALS and bull > bear:
+        return DIR_UP, min(1.0, total / 2.0), total, bull, bear
+    if bear >= MIN_ALIGNED_SIGNALS and bear > bull:
+        return DIR_DOWN, min(1.0, abs(total) / 2.0), total, bull, bear
+    return DIR_SKIP, 0.0, total, bull, bear
+
+
+@numba.njit(parallel=True)
+def _score_windows(rate, long_usd, short_usd, wall_ratio, ls_ratio, news_score,
+                   dir_code, confidence, total_score, bull_cnt, bear_cnt):
+    for i in numba.prange(rate.shape[0]):
+        (dir_code[i], confidence[i], total_score[i],
+         bull_cnt[i], bear_cnt[i]) = _score_window(
+            rate[i], long_usd[i], short_usd[i], wall_ratio[i], ls_ratio[i], news_score[i],
+            not np.isnan(rate[i]),
+            not (np.isnan(long_usd[i]) or np.isnan(short_usd[i])),
+            not np.isnan(wall_ratio[i]),
+            not np.isnan(ls_ratio[i]),
+            not np.isnan(news_score[i]),
+        )
+
+
+def score_windows(rate, long_usd, short_usd, wall_ratio, ls_ratio, news_score):
+    """
+    Scores T windows at once from per-window input columns (length-T float arrays,
+    NaN where an input is missing). Runs in parallel across windows.
+    Returns dict of dir_code, confidence, total_score, bull_cnt, bear_cnt arrays.
+    """
+    columns = [np.ascontiguousarray(c, dtype=np.float64)
+               for c in (rate, long_usd, short_usd, wall_ratio, ls_ratio, news_score)]
+    n = columns[0].shape[0]
+    out = {
+        'dir_code': np.empty(n, dtype=np.int8),
+        'confidence': np.empty(n),
+        'total_score': np.empty(n),
+        'bull_cnt': np.empty(n, dtype=np.int8),
+        'bear_cnt': np.empty(n, dtype=np.int8),
+    }
+    _score_windows(*columns, *out.values())
+    return out
+
+
+def generate_signals_batch(scores, dirs):
+    """
+    generate_signal over T recorded windows at once.
+    scores: (T, 5) analyzer scores, dirs: (T, 5) directions as -1/0/+1, columns in SIGNAL_KEYS order.
+    Returns dict of dir_code, confidence, weighted_score, bull_cnt, bear_cnt arrays.
+    """
+    total = scores @ _WEIGHTS
+    bull = (dirs == 1).sum(1)
+    bear = (dirs == -1).sum(1)
+    up = (bull >= MIN_ALIGNED_SIGNALS) & (bull > bear)
+    down = (bear >= MIN_ALIGNED_SIGNALS) & (bear > bull)
+    return {
+        'dir_code': np.where(up, DIR_UP, np.where(down, DIR_DOWN, DIR_SKIP)),
+        'confidence': np.where(up, np.minimum(1.0, total / 2.0),
+                               np.where(down, np.minimum(1.0, np.abs(total) / 2.0), 0.0)),
+        'weighted_score': total,
+        'bull_cnt': bull,
+        'bear_cnt': bear,
+    }
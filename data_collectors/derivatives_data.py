@@ -1,9 +1,39 @@
 
-import requests
+import heapq
+import httpx
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 OKX_BASE_URL = "https://www.okx.com"
 
+# Number of most recent liquidation events to keep
+MAX_LIQUIDATION_EVENTS = 20
+
+
+@dataclass(slots=True)
+class LiqEvent:
+    """A single liquidation order. Serialized by orjson like a dict."""
+    side: str
+    price: float
+    size_btc: float
+    value_usd: float
+    time: int
+
+
+# One HTTP/2 client for all OKX calls: the concurrent fetches share a single
+# keep-alive connection as multiplexed streams instead of one TLS session each
+_client = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+    ),
+    headers={"Accept-Encoding": "gzip, br"},
+    timeout=httpx.Timeout(10.0, connect=2.0),
+)
+
 
 def get_funding_rate():
     """
@@ -18,13 +48,12 @@ def get_funding_rate():
 
     # Current funding rate
     try:
-        r = requests.get(
+        r = _client.get(
             f"{OKX_BASE_URL}/api/v5/public/funding-rate",
-            params={'instId': 'BTC-USDT-SWAP'},
-            timeout=10
+            params={'instId': 'BTC-USDT-SWAP'}
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         if data.get('data'):
             item = data['data'][0]
             result['current_rate'] = float(item['fundingRate'])
@@ -34,13 +63,12 @@ def get_funding_rate():
 
     # Recent funding rate history (last 10 settlements)
     try:
-        r = requests.get(
+        r = _client.get(
             f"{OKX_BASE_URL}/api/v5/public/funding-rate-history",
-            params={'instId': 'BTC-USDT-SWAP', 'limit': '10'},
-            timeout=10
+            params={'instId': 'BTC-USDT-SWAP', 'limit': '10'}
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         if data.get('data'):
             for item in data['data']:
                 result['recent_rates'].append({
@@ -59,13 +87,12 @@ def get_open_interest():
     Returns dict with OI in contracts and in BTC.
     """
     try:
-        r = requests.get(
+        r = _client.get(
             f"{OKX_BASE_URL}/api/v5/public/open-interest",
-            params={'instType': 'SWAP', 'instId': 'BTC-USDT-SWAP'},
-            timeout=10
+            params={'instType': 'SWAP', 'instId': 'BTC-USDT-SWAP'}
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         if data.get('data'):
             item = data['data'][0]
             return {
@@ -85,13 +112,12 @@ def get_long_short_ratio():
     Returns the most recent ratio and a short history.
     """
     try:
-        r = requests.get(
+        r = _client.get(
             f"{OKX_BASE_URL}/api/v5/rubik/stat/contracts/long-short-account-ratio",
-            params={'ccy': 'BTC', 'period': '1H'},
-            timeout=10
+            params={'ccy': 'BTC', 'period': '1H'}
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         if data.get('data'):
             history = []
             for item in data['data'][:12]:  # Last 12 hours
@@ -114,23 +140,25 @@ def get_recent_liquidations():
     Returns aggregated long/short liquidation volumes and individual events.
     """
     try:
-        r = requests.get(
+        r = _client.get(
             f"{OKX_BASE_URL}/api/v5/public/liquidation-orders",
             params={
                 'instType': 'SWAP',
                 'uly': 'BTC-USDT',
                 'state': 'filled',
-            },
-            timeout=10
+            }
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
 
         long_liqs = 0.0
         short_liqs = 0.0
         long_count = 0
         short_count = 0
-        events = []
+        # Min-heap of the newest events seen so far, as (time, -seq, ...) tuples;
+        # -seq keeps earlier events first among equal timestamps.
+        newest = []
+        seq = 0
 
         if data.get('data'):
             for batch in data['data']:
@@ -147,13 +175,12 @@ def get_recent_liquidations():
                         short_liqs += value_usd
                         short_count += 1
 
-                    events.append({
-                        'side': pos_side,
-                        'price': price,
-                        'size_btc': size,
-                        'value_usd': value_usd,
-                        'time': int(detail['ts']),
-                    })
+                    event = (int(detail['ts']), -seq, pos_side, price, size, value_usd)
+                    seq += 1
+                    if len(newest) < MAX_LIQUIDATION_EVENTS:
+                        heapq.heappush(newest, event)
+                    else:
+                        heapq.heappushpop(newest, event)
 
         return {
             'long_liquidation_usd': long_liqs,
@@ -161,21 +188,34 @@ def get_recent_liquidations():
             'long_count': long_count,
             'short_count': short_count,
             'total_usd': long_liqs + short_liqs,
-            'recent_events': sorted(events, key=lambda x: x['time'], reverse=True)[:20],
+            'recent_events': [
+                LiqEvent(side, price, size, value_usd, ts)
+                for ts, _, side, price, size, value_usd in sorted(newest, reverse=True)
+            ],
         }
     except Exception as e:
         print(f"Error fetching liquidations: {e}")
     return None
 
 
-def get_all_derivatives_data():
-    """Fetches all derivatives data in one call. Returns a combined dict."""
-    return {
-        'funding': get_funding_rate(),
-        'open_interest': get_open_interest(),
-        'long_short_ratio': get_long_short_ratio(),
-        'liquidations': get_recent_liquidations(),
+def get_all_derivatives_data(executor=None):
+    """
+    Fetches all derivatives data in one call. Returns a combined dict.
+    The endpoints are independent, so they are fetched concurrently, on
+    `executor` if given (it needs a free worker per endpoint) or a private pool.
+    """
+    fetchers = {
+        'funding': get_funding_rate,
+        'open_interest': get_open_interest,
+        'long_short_ratio': get_long_short_ratio,
+        'liquidations': get_recent_liquidations,
     }
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            return get_all_derivatives_data(executor)
+
+    futures = {key: executor.submit(fn) for key, fn in fetchers.items()}
+    return {key: future.result() for key, future in futures.items()}
 
 
 if __name__ == "__main__":
@@ -224,7 +264,7 @@ if __name__ == "__main__":
         if liqs['recent_events']:
             print(f"\nLast 5 liquidations:")
             for ev in liqs['recent_events'][:5]:
-                t = datetime.fromtimestamp(ev['time'] / 1000, tz=timezone.utc)
-                print(f"  {ev['side']:5s} | {ev['size_btc']:.2f} BTC @ ${ev['price']:,.1f} (${ev['value_usd']:,.0f}) | {t.strftime('%H:%M:%S')}")
+                t = datetime.fromtimestamp(ev.time / 1000, tz=timezone.utc)
+                print(f"  {ev.side:5s} | {ev.size_btc:.2f} BTC @ ${ev.price:,.1f} (${ev.value_usd:,.0f}) | {t.strftime('%H:%M:%S')}")
     else:
         print("Failed to fetch liquidations.")
@@ -1,9 +1,15 @@
 
 import ccxt
+import functools
 import time
+import numpy as np
 
+@functools.lru_cache(maxsize=1)
 def get_exchange_instance():
-    """Returns a ccxt exchange instance (Kraken)."""
+    """
+    Returns a ccxt exchange instance (Kraken).
+    Built once per process so market metadata is only loaded on first use.
+    """
     return ccxt.kraken({
         'enableRateLimit': True,
     })
@@ -28,6 +34,11 @@ def get_order_book(limit=20):
         print(f"Error fetching order book: {e}")
         return None
 
+def _book_side(levels):
+    """Returns one side of the order book as an (N, 2) float array of [price, amount]."""
+    arr = np.asarray(levels, dtype=np.float64)
+    return arr[:, :2] if arr.ndim == 2 else np.empty((0, 2))
+
 def calculate_wall_strength(order_book, price_range_percent=0.01):
     """
     Calculates the strength of bid and ask walls within a certain percentage of the current price.
@@ -55,8 +66,10 @@ def calculate_wall_strength(order_book, price_range_percent=0.01):
     lower_bound = mid_price * (1 - price_range_percent)
     upper_bound = mid_price * (1 + price_range_percent)
 
-    bid_wall_volume = sum(entry[1] for entry in bids if entry[0] >= lower_bound)
-    ask_wall_volume = sum(entry[1] for entry in asks if entry[0] <= upper_bound)
+    bids_arr = _book_side(bids)
+    asks_arr = _book_side(asks)
+    bid_wall_volume = bids_arr[bids_arr[:, 0] >= lower_bound, 1].sum()
+    ask_wall_volume = asks_arr[asks_arr[:, 0] <= upper_bound, 1].sum()
 
     wall_ratio = bid_wall_volume / ask_wall_volume if ask_wall_volume > 0 else float('inf')
 
@@ -1,7 +1,12 @@
 
-import requests
+import functools
+import re
+import httpx
+import orjson
+import ahocorasick
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 CRYPTOCOMPARE_NEWS_URL = "https://min-api.cryptocompare.com/data/v2/news/"
 
@@ -17,6 +22,85 @@ BEARISH_KEYWORDS = [
     'liquidation', 'outflow', 'sec', 'lawsuit', 'fraud',
 ]
 
+# Inflected forms that count as the single-word keyword they belong to
+KEYWORD_FORMS = {
+    'rally': ('rallies', 'rallied', 'rallying'),
+    'surge': ('surges', 'surged', 'surging'),
+    'breakout': ('breakouts',),
+    'inflow': ('inflows',),
+    'hack': ('hacks', 'hacking'),
+    'exploit': ('exploits', 'exploited'),
+    'ban': ('bans', 'banning'),
+    'crackdown': ('crackdowns',),
+    'crash': ('crashes', 'crashed', 'crashing'),
+    'plunge': ('plunges', 'plunged', 'plunging'),
+    'dump': ('dumps', 'dumped', 'dumping'),
+    'sell-off': ('sell-offs',),
+    'selloff': ('selloffs',),
+    'liquidation': ('liquidations',),
+    'outflow': ('outflows',),
+    'lawsuit': ('lawsuits',),
+}
+
+
+def _token_map(keywords):
+    """Maps each single-word keyword, and its forms in KEYWORD_FORMS, to the keyword."""
+    return {
+        form: kw
+        for kw in keywords if ' ' not in kw
+        for form in (kw, *KEYWORD_FORMS.get(kw, ()))
+    }
+
+
+# Single-word keywords are matched as whole tokens (so 'sec' no longer fires on
+# 'second', nor 'ath' on 'bath'); multi-word phrases still need a substring scan.
+BULL_TOKENS = _token_map(BULLISH_KEYWORDS)
+BULL_PHRASES = tuple(kw for kw in BULLISH_KEYWORDS if ' ' in kw)
+BEAR_TOKENS = _token_map(BEARISH_KEYWORDS)
+BEAR_PHRASES = tuple(kw for kw in BEARISH_KEYWORDS if ' ' in kw)
+
+_TOKEN_RE = re.compile(r'[a-z-]+')
+
+
+# Scores above +X label bullish, below -X bearish (per headline and for the overall average)
+SENTIMENT_THRESHOLD = 0.1
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """A scored headline. Serialized by orjson like a dict."""
+    title: str
+    source: str
+    published_at: int
+    url: str
+    categories: str
+    sentiment: dict
+
+
+def _build_phrase_automaton():
+    """
+    Builds a single Aho-Corasick automaton over both phrase lists,
+    so each headline is scanned once instead of once per phrase.
+    """
+    automaton = ahocorasick.Automaton()
+    for phrase in BULL_PHRASES:
+        automaton.add_word(phrase, ('bullish', phrase))
+    for phrase in BEAR_PHRASES:
+        automaton.add_word(phrase, ('bearish', phrase))
+    automaton.make_automaton()
+    return automaton
+
+
+_PHRASE_AUTOMATON = _build_phrase_automaton()
+_VADER = SentimentIntensityAnalyzer()
+
+# Kept alive across refreshes so the news fetch reuses its HTTP/2 connection
+_client = httpx.Client(
+    http2=True,
+    headers={"Accept-Encoding": "gzip, br"},
+    timeout=httpx.Timeout(10.0, connect=2.0),
+)
+
 
 def get_btc_news(limit=10):
     """
@@ -24,17 +108,16 @@ def get_btc_news(limit=10):
     Returns list of news items with title, source, time, url, and sentiment.
     """
     try:
-        r = requests.get(
+        r = _client.get(
             CRYPTOCOMPARE_NEWS_URL,
             params={
                 'categories': 'BTC',
                 'lang': 'EN',
                 'sortOrder': 'latest',
             },
-            timeout=10,
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
 
         if not data.get('Data'):
             return []
@@ -45,14 +128,14 @@ def get_btc_news(limit=10):
             body = item.get('body', '')
             sentiment = analyze_sentiment(title, body)
 
-            news_items.append({
-                'title': title,
-                'source': item.get('source_info', {}).get('name', item.get('source', 'Unknown')),
-                'published_at': int(item.get('published_on', 0)),
-                'url': item.get('url', ''),
-                'categories': item.get('categories', ''),
-                'sentiment': sentiment,
-            })
+            news_items.append(NewsItem(
+                title=title,
+                source=item.get('source_info', {}).get('name', item.get('source', 'Unknown')),
+                published_at=int(item.get('published_on', 0)),
+                url=item.get('url', ''),
+                categories=item.get('categories', ''),
+                sentiment=sentiment,
+            ))
 
         return news_items
     except Exception as e:
@@ -60,20 +143,31 @@ def get_btc_news(limit=10):
         return []
 
 
+@functools.lru_cache(maxsize=512)
+def _polarity(title):
+    """
+    VADER compound polarity of a headline, memoized.
+    Headlines persist across many refreshes, so most calls are cache hits.
+    """
+    return _VADER.polarity_scores(title)['compound']
+
+
 def analyze_sentiment(title, body=""):
     """
-    Analyzes sentiment of a news headline using TextBlob + keyword matching.
+    Analyzes sentiment of a news headline using VADER + keyword matching.
     Returns dict with polarity score and label (bullish/bearish/neutral).
     """
     text = f"{title} {body[:200]}".lower()
 
-    # TextBlob polarity: -1 (negative) to +1 (positive)
-    blob = TextBlob(title)
-    polarity = blob.sentiment.polarity
+    # VADER compound polarity: -1 (negative) to +1 (positive)
+    polarity = _polarity(title)
 
-    # Keyword boost
-    bullish_hits = sum(1 for kw in BULLISH_KEYWORDS if kw in text)
-    bearish_hits = sum(1 for kw in BEARISH_KEYWORDS if kw in text)
+    # Keyword boost (each keyword counts once, however often it appears)
+    tokens = set(_TOKEN_RE.findall(text))
+    phrases = {value for _, value in _PHRASE_AUTOMATON.iter(text)}
+    bullish_phrases = sum(1 for label, _ in phrases if label == 'bullish')
+    bullish_hits = len({BULL_TOKENS[t] for t in tokens if t in BULL_TOKENS}) + bullish_phrases
+    bearish_hits = len({BEAR_TOKENS[t] for t in tokens if t in BEAR_TOKENS}) + len(phrases) - bullish_phrases
 
     keyword_score = (bullish_hits - bearish_hits) * 0.2
     combined_score = polarity + keyword_score
@@ -81,9 +175,9 @@ def analyze_sentiment(title, body=""):
     # Clamp to [-1, 1]
     combined_score = max(-1.0, min(1.0, combined_score))
 
-    if combined_score > 0.1:
+    if combined_score > SENTIMENT_THRESHOLD:
         label = 'bullish'
-    elif combined_score < -0.1:
+    elif combined_score < -SENTIMENT_THRESHOLD:
         label = 'bearish'
     else:
         label = 'neutral'
@@ -106,15 +200,15 @@ def get_news_summary():
     if not news:
         return None
 
-    scores = [n['sentiment']['score'] for n in news]
+    scores = [n.sentiment['score'] for n in news]
     avg_score = sum(scores) / len(scores)
-    bullish_count = sum(1 for n in news if n['sentiment']['label'] == 'bullish')
-    bearish_count = sum(1 for n in news if n['sentiment']['label'] == 'bearish')
-    neutral_count = sum(1 for n in news if n['sentiment']['label'] == 'neutral')
+    bullish_count = sum(1 for n in news if n.sentiment['label'] == 'bullish')
+    bearish_count = sum(1 for n in news if n.sentiment['label'] == 'bearish')
+    neutral_count = sum(1 for n in news if n.sentiment['label'] == 'neutral')
 
-    if avg_score > 0.1:
+    if avg_score > SENTIMENT_THRESHOLD:
         overall = 'bullish'
-    elif avg_score < -0.1:
+    elif avg_score < -SENTIMENT_THRESHOLD:
         overall = 'bearish'
     else:
         overall = 'neutral'
@@ -138,11 +232,11 @@ if __name__ == "__main__":
     print(f"\nFetched {len(news)} headlines:\n")
 
     for i, item in enumerate(news, 1):
-        t = datetime.fromtimestamp(item['published_at'], tz=timezone.utc)
-        s = item['sentiment']
+        t = datetime.fromtimestamp(item.published_at, tz=timezone.utc)
+        s = item.sentiment
         indicator = {'bullish': '+', 'bearish': '-', 'neutral': '~'}[s['label']]
-        print(f"  {i:2d}. [{indicator}] {item['title'][:80]}")
-        print(f"      Source: {item['source']} | {t.strftime('%H:%M UTC')} | Score: {s['score']}")
+        print(f"  {i:2d}. [{indicator}] {item.title[:80]}")
+        print(f"      Source: {item.source} | {t.strftime('%H:%M UTC')} | Score: {s['score']}")
         print()
 
     print("-" * 60)
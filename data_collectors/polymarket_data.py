@@ -1,30 +1,130 @@
 
 from py_clob_client.client import ClobClient
-import requests
-import json
+from cachetools import TTLCache
+import functools
+import httpx
+import logging
+import orjson
+import os
+import re
+import simdjson
+import threading
+import time
 from datetime import datetime, timezone
 
 # Polymarket CLOB API URL
 CLOB_API_URL = "https://clob.polymarket.com"
 GAMMA_API_URL = "https://gamma-api.polymarket.com"
 
+log = logging.getLogger(__name__)
+
+# Loose Bitcoin match for (lower-cased) market questions
+_BTC_RE = re.compile(r'btc|bitcoin')
+
+# Reused across polls so simdjson keeps its parse buffers. Objects it returns are
+# views into those buffers and the parser refuses to parse again while any are
+# alive, so parsing and reading happen under a lock and kept markets are copied out.
+_PARSER = simdjson.Parser()
+_PARSER_LOCK = threading.Lock()
+
+# The Gamma market list barely moves within a minute, so repeated analysis passes
+# reuse it. Kept shorter than the app's refresh interval so each scheduled
+# refresh still sees fresh odds. TTLCache is not thread-safe, hence the lock.
+MARKETS_CACHE_TTL_SECONDS = 30
+_MARKETS_CACHE = TTLCache(maxsize=4, ttl=MARKETS_CACHE_TTL_SECONDS)
+_MARKETS_CACHE_LOCK = threading.Lock()
+
+# Gamma sorts by 24h volume, so the top page normally holds the live BTC markets;
+# the wider page is only requested when the top one has none
+MARKETS_PAGE_LIMIT = 25
+MARKETS_FALLBACK_LIMIT = 100
+
+# Pooled keep-alive client for Gamma + CLOB so polls reuse their TLS connections
+_client = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+    ),
+    headers={"Accept-Encoding": "gzip, br"},
+    timeout=httpx.Timeout(5.0, connect=2.0),
+)
+
+
+def parse_maybe_json(value):
+    """
+    Gamma returns list fields (clobTokenIds, outcomes, outcomePrices) as JSON strings,
+    but sometimes as real lists. Accepts either shape.
+    """
+    return orjson.loads(value) if isinstance(value, str) else value
+
+
+@functools.lru_cache(maxsize=1)
+def _clob_client():
+    # constant_derivation=False is often needed for read-only or valid checks
+    return ClobClient(host=CLOB_API_URL, chain_id=137)
+
 def get_polymarket_client():
     """
-    Returns a ClobClient instance. 
+    Returns a ClobClient instance, built once per process (a failed build is retried next call).
     Note: For read-only public data, we might not need keys, 
     but the client might enforce them. If so, we'll use raw requests.
     """
     try:
-        # constant_derivation=False is often needed for read-only or valid checks
-        return ClobClient(host=CLOB_API_URL, chain_id=137) 
+        return _clob_client()
     except Exception as e:
         print(f"Error initializing ClobClient: {e}")
         return None
 
+def _parse_end_ts(end_date_str):
+    """
+    Parses a Gamma ISO end date (e.g. 2026-02-12T17:00:00Z) into a POSIX timestamp.
+    Dates without an offset are taken as UTC. Raises ValueError if the format is not ISO 8601.
+    """
+    end_date = datetime.fromisoformat(end_date_str)
+    if end_date.tzinfo is None:
+        end_date = end_date.replace(tzinfo=timezone.utc)
+    return int(end_date.timestamp())
+
+def _filter_btc_markets(markets):
+    """
+    Keeps future Bitcoin markets from a parsed Gamma response, "Up or Down" ones first.
+    Only question/endDate are read from each market; kept ones are materialized to dicts.
+    """
+    # If markets is a dict with 'data', extract it. Some APIs wrap the list.
+    if isinstance(markets, simdjson.Object) and 'data' in markets:
+        markets = markets['data']
+
+    # Filter for future markets
+    now_ts = int(time.time())
+    updown_markets = []
+    other_markets = []
+    for market in markets:
+        question = (market.get('question') or '').lower()
+        end_date_str = market.get('endDate')
+        if end_date_str:
+            try:
+                end_ts = _parse_end_ts(end_date_str)
+            except ValueError:
+                continue # Skip if date format is weird
+
+            if end_ts < now_ts:
+                continue # Skip past markets
+
+        # Loose filter for Bitcoin related markets, "Up or Down" ones first
+        if _BTC_RE.search(question):
+            if 'up or down' in question:
+                updown_markets.append(market.as_dict())
+            else:
+                other_markets.append(market.as_dict())
+
+    return updown_markets + other_markets
+
 def get_active_btc_markets():
     """
     Fetches active Bitcoin markets, filtering for 15-min or high-frequency binary options.
     Uses the Gamma API (easier for discovery than CLOB API).
+    Successful results are cached for MARKETS_CACHE_TTL_SECONDS.
     """
     # First, let's try to find the tag ID for "Bitcoin" if possible, or just search broadly.
     # The Gamma API endpoint /events is often better for grouped markets.
@@ -33,79 +133,62 @@ def get_active_btc_markets():
     url = f"{GAMMA_API_URL}/markets"
     
     params = {
-        "limit": 100,
+        "limit": MARKETS_PAGE_LIMIT,
         "active": "true",
         "closed": "false",
         "tag_slug": "bitcoin", # Try filtering by tag slug directly if supported
         "order": "volume24hr", # Order by volume to find popular ones
         "ascending": "false"
     }
-    
+
+    with _MARKETS_CACHE_LOCK:
+        cached = _MARKETS_CACHE.get('markets')
+    if cached is not None:
+        return cached
+
     try:
-        response = requests.get(url, params=params)
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
-            print(f"Gamma API Error: {e}")
-            print(f"Response: {response.text[:200]}")
-            return []
-            
-        markets = response.json()
-        
-        # If markets is a dict with 'data', extract it. Some APIs wrap the list.
-        if isinstance(markets, dict) and 'data' in markets:
-            markets = markets['data']
-            
-        # Filter for future markets
-        current_time = datetime.now(timezone.utc).replace(tzinfo=None)
-        btc_markets = []
-        for market in markets:
-            question = market.get('question', '').lower()
-            end_date_str = market.get('endDate')
-            if end_date_str:
-                # Handle ISO format Z (e.g. 2026-02-12T17:00:00Z)
-                try:
-                    end_date = datetime.strptime(end_date_str.replace('Z', ''), "%Y-%m-%dT%H:%M:%S")
-                except ValueError:
-                    continue # Skip if date format is weird
-                
-                if end_date < current_time:
-                    continue # Skip past markets
-
-            # Loose filter for Bitcoin related markets
-            if 'btc' in question or 'bitcoin' in question:
-                btc_markets.append(market)
-                
-        # Sort to prioritize "Up or Down"
-        btc_markets.sort(key=lambda m: "up or down" not in m.get('question', '').lower())
-        
-        return btc_markets
+        for limit in (MARKETS_PAGE_LIMIT, MARKETS_FALLBACK_LIMIT):
+            params["limit"] = limit
+            response = _client.get(url, params=params)
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                print(f"Gamma API Error: {e}")
+                print(f"Response: {response.text[:200]}")
+                return []
+
+            with _PARSER_LOCK:
+                markets = _filter_btc_markets(_PARSER.parse(response.content))
+            if markets:
+                break
+            log.debug("No BTC markets in top %d, widening", limit)
+
+        with _MARKETS_CACHE_LOCK:
+            _MARKETS_CACHE['markets'] = markets
+        return markets
     except Exception as e:
         print(f"General Error fetching markets: {e}")
         return []
 
-def extract_token_ids(market):
+def parse_market_context(market):
     """
-    Extracts clobTokenIds and outcomes from a market object.
-    The Gamma API returns these as JSON strings, not lists.
-    Returns list of dicts: [{'outcome': 'Up', 'token_id': '...'}, ...]
+    Parses a market's token ids, outcome labels and outcome prices in one pass.
+    Returns dict of outcome label -> {'token_id', 'price'}; empty if the market has no tokens.
     """
-    clob_ids_raw = market.get('clobTokenIds', '[]')
-    if isinstance(clob_ids_raw, str):
-        clob_ids = json.loads(clob_ids_raw)
-    else:
-        clob_ids = clob_ids_raw
-
-    outcomes_raw = market.get('outcomes', '[]')
-    if isinstance(outcomes_raw, str):
-        outcomes = json.loads(outcomes_raw)
-    else:
-        outcomes = outcomes_raw
+    clob_ids = market.get('clobTokenIds')
+    if not clob_ids:
+        return {}
+    clob_ids = parse_maybe_json(clob_ids)
+    outcomes = parse_maybe_json(market.get('outcomes') or '[]')
+    prices = parse_maybe_json(market.get('outcomePrices') or '[]')
 
-    result = []
+    result = {}
     for i, tid in enumerate(clob_ids):
         outcome_label = outcomes[i] if i < len(outcomes) else f"Outcome {i}"
-        result.append({'outcome': outcome_label, 'token_id': tid})
+        result[outcome_label] = {
+            'token_id': tid,
+            'price': float(prices[i]) if i < len(prices) else None,
+        }
     return result
 
 
@@ -113,31 +196,50 @@ def get_market_prices(condition_id):
     """
     Fetches the current order book or price for a specific condition_id (market).
     """
-    print(f"DEBUG: Fetching price for condition/token ID: {condition_id}")
+    log.debug("Fetching price for condition/token ID: %s", condition_id)
     # We can use the ClobClient to get the orderbook or ticker
     client = get_polymarket_client()
     if client:
         try:
-            print("DEBUG: Using ClobClient...")
+            log.debug("Using ClobClient...")
             book = client.get_order_book(condition_id)
-            print("DEBUG: ClobClient returned book.")
+            log.debug("ClobClient returned book.")
             return book
         except Exception as e:
             print(f"Error fetching orderbook via Client: {e}")
     
     # Fallback to REST if client fails
     try:
-        print("DEBUG: Falling back to REST API...")
+        log.debug("Falling back to REST API...")
         url = f"{CLOB_API_URL}/book"
         params = {"token_id": condition_id} 
-        response = requests.get(url, params=params)
-        print(f"DEBUG: REST API Status: {response.status_code}")
-        return response.json()
+        response = _client.get(url, params=params)
+        log.debug("REST API Status: %s", response.status_code)
+        return orjson.loads(response.content)
     except Exception as e:
         print(f"Error fetching book via REST: {e}")
         return None
 
+def get_market_prices_batch(token_ids):
+    """
+    Fetches order books for several tokens in one POST to the CLOB /books endpoint.
+    Returns dict of token_id -> book (same shape as the /book REST response).
+    """
+    try:
+        response = _client.post(
+            f"{CLOB_API_URL}/books",
+            json=[{"token_id": tid} for tid in token_ids],
+        )
+        response.raise_for_status()
+        return {book['asset_id']: book for book in orjson.loads(response.content)}
+    except Exception as e:
+        print(f"Error fetching books via REST: {e}")
+        return {}
+
 if __name__ == "__main__":
+    # DEBUG=1 turns on the request-level debug output
+    logging.basicConfig(level=logging.DEBUG if os.environ.get("DEBUG") == "1" else logging.INFO)
+
     print("Fetching Active BTC Markets...")
     markets = get_active_btc_markets()
     print(f"Found {len(markets)} active BTC markets.")
@@ -158,26 +260,17 @@ if __name__ == "__main__":
         print(f"Best Bid: {first_market.get('bestBid')}")
         print(f"Best Ask: {first_market.get('bestAsk')}")
 
-        # Extract token IDs - clobTokenIds is a JSON string, not a list
-        clob_ids_raw = first_market.get('clobTokenIds', '[]')
-        if isinstance(clob_ids_raw, str):
-            clob_ids = json.loads(clob_ids_raw)
-        else:
-            clob_ids = clob_ids_raw
-
-        outcomes_raw = first_market.get('outcomes', '[]')
-        if isinstance(outcomes_raw, str):
-            outcomes = json.loads(outcomes_raw)
-        else:
-            outcomes = outcomes_raw
-
-        print(f"\nParsed Token IDs ({len(clob_ids)}):")
-        for i, tid in enumerate(clob_ids):
-            outcome_label = outcomes[i] if i < len(outcomes) else f"Outcome {i}"
+        # Parse token IDs per outcome - clobTokenIds is a JSON string, not a list
+        context = parse_market_context(first_market)
+
+        print(f"\nParsed Token IDs ({len(context)}):")
+        for outcome_label, info in context.items():
+            tid = info['token_id']
             print(f"  {outcome_label}: {tid[:20]}...{tid[-10:]}")
 
-        # Fetch order book for the first token (typically "Up" / "Yes")
-        if clob_ids:
-            print(f"\nFetching order book for '{outcomes[0] if outcomes else 'first token'}'...")
-            book = get_market_prices(clob_ids[0])
-            print("Order Book:", str(book)[:300])
+        # Fetch order books for every outcome token in one request
+        if context:
+            print(f"\nFetching order books for {len(context)} tokens...")
+            books = get_market_prices_batch([info['token_id'] for info in context.values()])
+            for outcome_label, info in context.items():
+                print(f"Order Book ({outcome_label}):", str(books.get(info['token_id']))[:300])
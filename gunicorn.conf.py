@@ -0,0 +1,25 @@
+"""
+Gunicorn settings for serving the dashboard:
+
+    gunicorn app:app
+
+A single gevent worker serves concurrent API polls cooperatively while the
+refresh scheduler runs in the same process, so the in-memory cache stays
+authoritative. Scaling past one worker would need the cache moved out of
+process first.
+"""
+
+bind = '0.0.0.0:5124'
+workers = 1
+worker_class = 'gevent'
+worker_connections = 1000
+
+
+def post_worker_init(worker):
+    """
+    Set up logging (DEBUG=1 for debug output) and start the background refresh
+    inside the worker that serves the cache.
+    """
+    from app import configure_logging, start_scheduler
+    configure_logging()
+    start_scheduler()
@@ -1,11 +1,18 @@
 
+import logging
+import os
+import threading
 import time
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from data_collectors.market_data import get_btc_price, get_order_book, calculate_wall_strength
-from data_collectors.polymarket_data import get_active_btc_markets, extract_token_ids, get_market_prices
+from data_collectors.polymarket_data import MARKETS_CACHE_TTL_SECONDS, get_active_btc_markets, get_market_prices, parse_market_context
 from data_collectors.derivatives_data import get_all_derivatives_data
 from data_collectors.news_data import get_news_summary
 
 # --- Thresholds (tunable) ---
+# Bound into the analyzers as default args at import, so edit them here rather than at runtime.
 # Funding rate: annualized thresholds for "extreme"
 # OKX returns per-8h rate. E.g. 0.01% per 8h = 0.0001
 FUNDING_HIGH_THRESHOLD = 0.0001    # 0.01% per 8h — longs crowded
@@ -18,14 +25,50 @@ LIQ_DOMINANCE_RATIO = 1.5
 WALL_BID_STRONG = 1.3    # bid volume > 1.3x ask volume = bid wall dominant
 WALL_ASK_STRONG = 0.77   # bid volume < 0.77x ask volume = ask wall dominant (inverse of 1.3)
 
+# Long/short account ratio: typical range is 0.5-3.0, extremes beyond these are notable
+LS_RATIO_HIGH = 2.5      # longs very crowded
+LS_RATIO_LOW = 0.7       # shorts very crowded
+
 # Polymarket max share price for "decent odds"
 MAX_SHARE_PRICE = 0.55
 
 # Minimum signals needed to generate a non-SKIP signal
 MIN_ALIGNED_SIGNALS = 2
 
+# Weight each signal: funding & liquidations are primary, order book secondary, news confirming
+SIGNAL_WEIGHTS = (
+    ('funding', 1.5),
+    ('liquidations', 1.5),
+    ('order_book', 1.0),
+    ('long_short_ratio', 0.5),
+    ('news', 0.5),
+)
+_DIR = {'bullish': 1, 'bearish': -1, 'neutral': 0}
+
+# Shared across refreshes, sized so every leaf fetch (4 sources + 4 OKX endpoints) runs at once
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='fetch')
+
+# News is the slowest collector, so the next cycle's fetch starts as soon as the
+# current one is consumed and is normally finished before it is needed
+NEWS_TIMEOUT_SECONDS = 10
+_news_future = None
+_news_lock = threading.Lock()
+
+# Polymarket context per conditionId, expiring alongside the cached market list
+_CONTEXT_CACHE = TTLCache(maxsize=16, ttl=MARKETS_CACHE_TTL_SECONDS)
+_CONTEXT_CACHE_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class Signal:
+    """One analyzer's verdict. Serialized by orjson like a dict."""
+    signal: str     # 'bullish', 'bearish' or 'neutral'
+    score: float
+    detail: str
 
-def analyze_funding(derivatives_data):
+
+def analyze_funding(derivatives_data, _high=FUNDING_HIGH_THRESHOLD, _low=FUNDING_LOW_THRESHOLD,
+                    _min=min, _abs=abs):
     """
     Analyze funding rate signal.
     High positive → longs crowded → bearish
@@ -34,31 +77,31 @@ def analyze_funding(derivatives_data):
     funding = derivatives_data.get('funding', {})
     rate = funding.get('current_rate')
     if rate is None:
-        return {'signal': 'neutral', 'score': 0, 'detail': 'No funding data'}
-
-    if rate >= FUNDING_HIGH_THRESHOLD:
-        strength = min(1.0, rate / (FUNDING_HIGH_THRESHOLD * 3))
-        return {
-            'signal': 'bearish',
-            'score': -strength,
-            'detail': f'Funding {rate*100:.4f}% — longs crowded, risk of pullback',
-        }
-    elif rate <= FUNDING_LOW_THRESHOLD:
-        strength = min(1.0, abs(rate) / (abs(FUNDING_LOW_THRESHOLD) * 3))
-        return {
-            'signal': 'bullish',
-            'score': strength,
-            'detail': f'Funding {rate*100:.4f}% — shorts crowded, risk of squeeze up',
-        }
+        return Signal('neutral', 0, 'No funding data')
+
+    if rate >= _high:
+        strength = _min(1.0, rate / (_high * 3))
+        return Signal(
+            signal='bearish',
+            score=-strength,
+            detail=f'Funding {rate*100:.4f}% — longs crowded, risk of pullback',
+        )
+    elif rate <= _low:
+        strength = _min(1.0, _abs(rate) / (_abs(_low) * 3))
+        return Signal(
+            signal='bullish',
+            score=strength,
+            detail=f'Funding {rate*100:.4f}% — shorts crowded, risk of squeeze up',
+        )
     else:
-        return {
-            'signal': 'neutral',
-            'score': 0,
-            'detail': f'Funding {rate*100:.4f}% — within normal range',
-        }
+        return Signal(
+            signal='neutral',
+            score=0,
+            detail=f'Funding {rate*100:.4f}% — within normal range',
+        )
 
 
-def analyze_liquidations(derivatives_data):
+def analyze_liquidations(derivatives_data, _ratio=LIQ_DOMINANCE_RATIO, _min=min):
     """
     Analyze liquidation data.
     Short liqs >> long liqs → shorts already squeezed → fuel exhausted → bearish
@@ -66,79 +109,79 @@ def analyze_liquidations(derivatives_data):
     """
     liqs = derivatives_data.get('liquidations')
     if not liqs:
-        return {'signal': 'neutral', 'score': 0, 'detail': 'No liquidation data'}
+        return Signal('neutral', 0, 'No liquidation data')
 
     long_usd = liqs['long_liquidation_usd']
     short_usd = liqs['short_liquidation_usd']
     total = liqs['total_usd']
 
     if total == 0:
-        return {'signal': 'neutral', 'score': 0, 'detail': 'No recent liquidations'}
+        return Signal('neutral', 0, 'No recent liquidations')
 
     # Ratio of dominant side
-    if short_usd > 0 and long_usd / short_usd >= LIQ_DOMINANCE_RATIO:
+    if short_usd > 0 and long_usd / short_usd >= _ratio:
         # Longs flushed → selling pressure exhausted → likely bounce
         ratio = long_usd / short_usd
-        strength = min(1.0, (ratio - 1) / 3)
-        return {
-            'signal': 'bullish',
-            'score': strength,
-            'detail': f'Long liqs ${long_usd:,.0f} vs short ${short_usd:,.0f} '
-                       f'(ratio {ratio:.1f}x) — longs flushed, bounce likely',
-        }
-    elif long_usd > 0 and short_usd / long_usd >= LIQ_DOMINANCE_RATIO:
+        strength = _min(1.0, (ratio - 1) / 3)
+        return Signal(
+            signal='bullish',
+            score=strength,
+            detail=f'Long liqs ${long_usd:,.0f} vs short ${short_usd:,.0f} '
+                    f'(ratio {ratio:.1f}x) — longs flushed, bounce likely',
+        )
+    elif long_usd > 0 and short_usd / long_usd >= _ratio:
         # Shorts squeezed → upside fuel exhausted → likely pullback
         ratio = short_usd / long_usd
-        strength = min(1.0, (ratio - 1) / 3)
-        return {
-            'signal': 'bearish',
-            'score': -strength,
-            'detail': f'Short liqs ${short_usd:,.0f} vs long ${long_usd:,.0f} '
-                       f'(ratio {ratio:.1f}x) — shorts squeezed, pullback likely',
-        }
+        strength = _min(1.0, (ratio - 1) / 3)
+        return Signal(
+            signal='bearish',
+            score=-strength,
+            detail=f'Short liqs ${short_usd:,.0f} vs long ${long_usd:,.0f} '
+                    f'(ratio {ratio:.1f}x) — shorts squeezed, pullback likely',
+        )
     else:
-        return {
-            'signal': 'neutral',
-            'score': 0,
-            'detail': f'Liquidations balanced — long ${long_usd:,.0f} vs short ${short_usd:,.0f}',
-        }
+        return Signal(
+            signal='neutral',
+            score=0,
+            detail=f'Liquidations balanced — long ${long_usd:,.0f} vs short ${short_usd:,.0f}',
+        )
 
 
-def analyze_order_book(wall_data):
+def analyze_order_book(wall_data, _bid_strong=WALL_BID_STRONG, _ask_strong=WALL_ASK_STRONG, _min=min):
     """
     Analyze order book walls.
     Strong bid wall (high ratio) → support below → bullish
     Strong ask wall (low ratio) → resistance above → bearish
     """
     if not wall_data:
-        return {'signal': 'neutral', 'score': 0, 'detail': 'No order book data'}
+        return Signal('neutral', 0, 'No order book data')
 
     ratio = wall_data['wall_ratio']
     bid_vol = wall_data['bid_wall_volume']
     ask_vol = wall_data['ask_wall_volume']
 
-    if ratio >= WALL_BID_STRONG:
-        strength = min(1.0, (ratio - 1) / 2)
-        return {
-            'signal': 'bullish',
-            'score': strength,
-            'detail': f'Bid wall dominant — bids {bid_vol:.2f} vs asks {ask_vol:.2f} '
-                       f'(ratio {ratio:.2f}) — support below',
-        }
-    elif ratio <= WALL_ASK_STRONG:
-        strength = min(1.0, (1 - ratio) / 0.5)
-        return {
-            'signal': 'bearish',
-            'score': -strength,
-            'detail': f'Ask wall dominant — bids {bid_vol:.2f} vs asks {ask_vol:.2f} '
-                       f'(ratio {ratio:.2f}) — resistance above',
-        }
+    if ratio >= _bid_strong:
+        strength = _min(1.0, (ratio - 1) / 2)
+        return Signal(
+            signal='bullish',
+            score=strength,
+            detail=f'Bid wall dominant — bids {bid_vol:.2f} vs asks {ask_vol:.2f} '
+                    f'(ratio {ratio:.2f}) — support below',
+        )
+    elif ratio <= _ask_strong:
+        strength = _min(1.0, (1 - ratio) / 0.5)
+        return Signal(
+            signal='bearish',
+            score=-strength,
+            detail=f'Ask wall dominant — bids {bid_vol:.2f} vs asks {ask_vol:.2f} '
+                    f'(ratio {ratio:.2f}) — resistance above',
+        )
     else:
-        return {
-            'signal': 'neutral',
-            'score': 0,
-            'detail': f'Walls balanced — ratio {ratio:.2f}',
-        }
+        return Signal(
+            signal='neutral',
+            score=0,
+            detail=f'Walls balanced — ratio {ratio:.2f}',
+        )
 
 
 def analyze_news(news_summary):
@@ -146,36 +189,36 @@ def analyze_news(news_summary):
     Analyze news sentiment as a confirming/conflicting signal.
     """
     if not news_summary:
-        return {'signal': 'neutral', 'score': 0, 'detail': 'No news data'}
+        return Signal('neutral', 0, 'No news data')
 
     sentiment = news_summary['overall_sentiment']
     score = news_summary['avg_score']
 
     if sentiment == 'bullish':
-        return {
-            'signal': 'bullish',
-            'score': score,
-            'detail': f'News sentiment bullish (score: {score:.3f}) — '
-                       f'{news_summary["bullish_count"]} bullish, '
-                       f'{news_summary["bearish_count"]} bearish headlines',
-        }
+        return Signal(
+            signal='bullish',
+            score=score,
+            detail=f'News sentiment bullish (score: {score:.3f}) — '
+                    f'{news_summary["bullish_count"]} bullish, '
+                    f'{news_summary["bearish_count"]} bearish headlines',
+        )
     elif sentiment == 'bearish':
-        return {
-            'signal': 'bearish',
-            'score': score,
-            'detail': f'News sentiment bearish (score: {score:.3f}) — '
-                       f'{news_summary["bullish_count"]} bullish, '
-                       f'{news_summary["bearish_count"]} bearish headlines',
-        }
+        return Signal(
+            signal='bearish',
+            score=score,
+            detail=f'News sentiment bearish (score: {score:.3f}) — '
+                    f'{news_summary["bullish_count"]} bullish, '
+                    f'{news_summary["bearish_count"]} bearish headlines',
+        )
     else:
-        return {
-            'signal': 'neutral',
-            'score': 0,
-            'detail': f'News sentiment neutral (score: {score:.3f})',
-        }
+        return Signal(
+            signal='neutral',
+            score=0,
+            detail=f'News sentiment neutral (score: {score:.3f})',
+        )
 
 
-def analyze_long_short_ratio(derivatives_data):
+def analyze_long_short_ratio(derivatives_data, _high=LS_RATIO_HIGH, _low=LS_RATIO_LOW, _min=min):
     """
     Analyze long/short account ratio as a contrarian signal.
     Very high ratio → too many longs → bearish
@@ -183,31 +226,30 @@ def analyze_long_short_ratio(derivatives_data):
     """
     ls = derivatives_data.get('long_short_ratio')
     if not ls or ls.get('current_ratio') is None:
-        return {'signal': 'neutral', 'score': 0, 'detail': 'No long/short data'}
+        return Signal('neutral', 0, 'No long/short data')
 
     ratio = ls['current_ratio']
 
-    # Typical range is 0.5-3.0. Extremes beyond 2.5 or below 0.7 are notable.
-    if ratio >= 2.5:
-        strength = min(1.0, (ratio - 2.0) / 2.0)
-        return {
-            'signal': 'bearish',
-            'score': -strength * 0.5,  # lower weight — confirming signal
-            'detail': f'L/S ratio {ratio:.2f} — longs very crowded (contrarian bearish)',
-        }
-    elif ratio <= 0.7:
-        strength = min(1.0, (1.0 - ratio) / 0.5)
-        return {
-            'signal': 'bullish',
-            'score': strength * 0.5,
-            'detail': f'L/S ratio {ratio:.2f} — shorts very crowded (contrarian bullish)',
-        }
+    if ratio >= _high:
+        strength = _min(1.0, (ratio - 2.0) / 2.0)
+        return Signal(
+            signal='bearish',
+            score=-strength * 0.5,  # lower weight — confirming signal
+            detail=f'L/S ratio {ratio:.2f} — longs very crowded (contrarian bearish)',
+        )
+    elif ratio <= _low:
+        strength = _min(1.0, (1.0 - ratio) / 0.5)
+        return Signal(
+            signal='bullish',
+            score=strength * 0.5,
+            detail=f'L/S ratio {ratio:.2f} — shorts very crowded (contrarian bullish)',
+        )
     else:
-        return {
-            'signal': 'neutral',
-            'score': 0,
-            'detail': f'L/S ratio {ratio:.2f} — within normal range',
-        }
+        return Signal(
+            signal='neutral',
+            score=0,
+            detail=f'L/S ratio {ratio:.2f} — within normal range',
+        )
 
 
 def generate_signal(signals_dict):
@@ -219,33 +261,12 @@ def generate_signal(signals_dict):
       ask wall + positive funding + short liqs dominant → DOWN
       Signals contradicting or < MIN_ALIGNED_SIGNALS → SKIP
     """
-    bullish_count = 0
-    bearish_count = 0
-    neutral_count = 0
-    total_score = 0.0
-
-    # Weight each signal: funding & liquidations are primary, order book secondary, news confirming
-    weights = {
-        'funding': 1.5,
-        'liquidations': 1.5,
-        'order_book': 1.0,
-        'long_short_ratio': 0.5,
-        'news': 0.5,
-    }
-
-    for key, signal in signals_dict.items():
-        w = weights.get(key, 1.0)
-        direction = signal['signal']
-        weighted_score = signal['score'] * w
-
-        if direction == 'bullish':
-            bullish_count += 1
-        elif direction == 'bearish':
-            bearish_count += 1
-        else:
-            neutral_count += 1
-
-        total_score += weighted_score
+    items = [(signals_dict[key], w) for key, w in SIGNAL_WEIGHTS if key in signals_dict]
+    total_score = sum((signal.score * w for signal, w in items), 0.0)
+    dirs = [_DIR[signal.signal] for signal, _ in items]
+    bullish_count = dirs.count(1)
+    bearish_count = dirs.count(-1)
+    neutral_count = len(dirs) - bullish_count - bearish_count
 
     # Determine final signal
     if bullish_count >= MIN_ALIGNED_SIGNALS and bullish_count > bearish_count:
@@ -274,30 +295,23 @@ def get_polymarket_context(markets):
         return None
 
     market = markets[0]
-    tokens = extract_token_ids(market)
-
-    # Parse outcome prices
-    import json
-    prices_raw = market.get('outcomePrices', '[]')
-    if isinstance(prices_raw, str):
-        prices = json.loads(prices_raw)
-    else:
-        prices = prices_raw
-
-    outcomes = {}
-    for i, token_info in enumerate(tokens):
-        price = float(prices[i]) if i < len(prices) else None
-        outcomes[token_info['outcome']] = {
-            'token_id': token_info['token_id'],
-            'price': price,
-        }
-
-    return {
+    condition_id = market.get('conditionId')
+    if condition_id is not None:
+        with _CONTEXT_CACHE_LOCK:
+            cached = _CONTEXT_CACHE.get(condition_id)
+        if cached is not None:
+            return cached
+
+    context = {
         'question': market.get('question'),
         'end_date': market.get('endDate'),
         'slug': market.get('slug'),
-        'outcomes': outcomes,
+        'outcomes': parse_market_context(market),
     }
+    if condition_id is not None:
+        with _CONTEXT_CACHE_LOCK:
+            _CONTEXT_CACHE[condition_id] = context
+    return context
 
 
 def check_odds_value(polymarket_context, direction):
@@ -337,52 +351,100 @@ def check_odds_value(polymarket_context, direction):
         }
 
 
-def run_full_analysis():
+def _claim_news_future():
+    """Returns the pre-warmed news fetch, starting one now if none is pending."""
+    global _news_future
+    with _news_lock:
+        future = _news_future or _FETCH_EXECUTOR.submit(get_news_summary)
+        _news_future = None
+    return future
+
+
+def _collect_news_summary(future):
     """
-    Run the complete signal analysis pipeline.
-    Fetches all data, analyzes each dimension, produces final signal.
+    Waits for a claimed news fetch and pre-warms the next cycle's. Returns None if
+    news takes too long; the slow fetch is then kept for the next cycle instead
+    of being repeated.
+    """
+    global _news_future
+    try:
+        news_summary = future.result(timeout=NEWS_TIMEOUT_SECONDS)
+    except TimeoutError:
+        print(f"News fetch exceeded {NEWS_TIMEOUT_SECONDS}s, continuing without news")
+        next_future = future
+        news_summary = None
+    else:
+        next_future = _FETCH_EXECUTOR.submit(get_news_summary)
+
+    with _news_lock:
+        if _news_future is None:
+            _news_future = next_future
+    return news_summary
+
+
+def configure_logging():
+    """
+    Logging setup for the entry points: DEBUG=1 turns on the collectors' debug
+    output. Otherwise logs are at INFO, with per-request/per-job chatter from
+    httpx and APScheduler kept to warnings.
+    """
+    debug = os.environ.get("DEBUG") == "1"
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+    if not debug:
+        for name in ('httpx', 'apscheduler'):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def fetch_inputs():
+    """
+    Fetch and condense every input the analysis depends on.
+    Returns a dict of btc_price, wall_strength, derivatives, polymarket, news_summary.
+    """
+    # Sources are independent, so fetch them concurrently. The derivatives
+    # endpoints fan out onto the same pool from this thread rather than
+    # tying up a worker that would only wait on a nested pool.
+    print("Fetching market, derivatives, Polymarket and news data...")
+    btc_price_future = _FETCH_EXECUTOR.submit(get_btc_price)
+    order_book_future = _FETCH_EXECUTOR.submit(get_order_book, limit=100)
+    markets_future = _FETCH_EXECUTOR.submit(get_active_btc_markets)
+    news_future = _claim_news_future()
+    derivatives = get_all_derivatives_data(_FETCH_EXECUTOR)
+
+    order_book = order_book_future.result()
+
+    return {
+        'btc_price': btc_price_future.result(),
+        'wall_strength': calculate_wall_strength(order_book) if order_book else None,
+        'derivatives': derivatives,
+        'polymarket': get_polymarket_context(markets_future.result()),
+        'news_summary': _collect_news_summary(news_future),
+    }
+
+
+def analyze_inputs(inputs):
+    """
+    Analyze each dimension of fetched inputs and produce the final signal.
     """
     result = {
         'timestamp': int(time.time()),
-        'btc_price': None,
-        'wall_strength': None,
-        'derivatives': None,
-        'polymarket': None,
-        'news_summary': None,
+        'btc_price': inputs['btc_price'],
+        'wall_strength': inputs['wall_strength'],
+        'derivatives': inputs['derivatives'],
+        'polymarket': inputs['polymarket'],
+        'news_summary': inputs['news_summary'],
         'signals': {},
         'final_signal': None,
         'odds_value': None,
     }
-
-    # --- Fetch all data ---
-    print("Fetching market data...")
-    btc_price = get_btc_price()
-    result['btc_price'] = btc_price
-
-    order_book = get_order_book(limit=100)
-    wall_strength = calculate_wall_strength(order_book) if order_book else None
-    result['wall_strength'] = wall_strength
-
-    print("Fetching derivatives data...")
-    derivatives = get_all_derivatives_data()
-    result['derivatives'] = derivatives
-
-    print("Fetching Polymarket data...")
-    markets = get_active_btc_markets()
-    polymarket_ctx = get_polymarket_context(markets)
-    result['polymarket'] = polymarket_ctx
-
-    print("Fetching news...")
-    news_summary = get_news_summary()
-    result['news_summary'] = news_summary
+    derivatives = inputs['derivatives']
 
     # --- Analyze each signal ---
     signals = {
         'funding': analyze_funding(derivatives),
         'liquidations': analyze_liquidations(derivatives),
-        'order_book': analyze_order_book(wall_strength),
+        'order_book': analyze_order_book(inputs['wall_strength']),
         'long_short_ratio': analyze_long_short_ratio(derivatives),
-        'news': analyze_news(news_summary),
+        'news': analyze_news(inputs['news_summary']),
     }
     result['signals'] = signals
 
@@ -391,13 +453,23 @@ def run_full_analysis():
     result['final_signal'] = final
 
     # --- Check odds value ---
-    odds = check_odds_value(polymarket_ctx, final['direction'])
+    odds = check_odds_value(inputs['polymarket'], final['direction'])
     result['odds_value'] = odds
 
     return result
 
 
+def run_full_analysis():
+    """
+    Run the complete signal analysis pipeline.
+    Fetches all data, analyzes each dimension, produces final signal.
+    """
+    return analyze_inputs(fetch_inputs())
+
+
 if __name__ == "__main__":
+    configure_logging()
+
     print("=" * 70)
     print("  ASCETIC0X SIGNAL ENGINE — Full Analysis")
     print("=" * 70)
@@ -410,8 +482,8 @@ if __name__ == "__main__":
 
     print("\n--- Individual Signals ---")
     for name, signal in analysis['signals'].items():
-        icon = {'bullish': '+', 'bearish': '-', 'neutral': '~'}[signal['signal']]
-        print(f"  [{icon}] {name:20s}: {signal['detail']}")
+        icon = {'bullish': '+', 'bearish': '-', 'neutral': '~'}[signal.signal]
+        print(f"  [{icon}] {name:20s}: {signal.detail}")
 
     print(f"\n--- Final Signal ---")
     final = analysis['final_signal']